@@ -11,23 +11,149 @@ import sys
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
 SKILLS_DIR = os.path.join(os.path.dirname(__file__), "..", "skills")
 OUTPUT_FILE = os.path.join(os.path.dirname(__file__), "..", "registry.json")
+CACHE_FILE = os.path.join(os.path.dirname(__file__), "..", ".registry-cache.json")
 
 REQUIRED_FIELDS = ["name", "description", "version", "author"]
 
+HASH_CHUNK_SIZE = 1 << 20  # 1 MiB
+# Below this many bytes to hash, a thread pool costs more than it saves.
+PARALLEL_HASH_MIN_BYTES = 4 << 20  # 4 MiB
+FRONTMATTER_READ_SIZE = 16 * 1024
+
 
-def compute_content_hash(skill_dir: str) -> str:
-    """Compute SHA-256 hash of all files in a skill directory."""
+def hash_file(filepath: str, size: int) -> bytes:
+    """Return the raw SHA-256 digest of a single file of (roughly) the given size."""
     hasher = hashlib.sha256()
+    # Read straight into one reused buffer, sized to the file for small ones,
+    # so each file costs a single read plus the EOF check.
+    buf = bytearray(max(1, min(size, HASH_CHUNK_SIZE)))
+    view = memoryview(buf)
+    with open(filepath, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            hasher.update(view[:n])
+    return hasher.digest()
+
+
+def iter_files(directory: str):
+    """Yield DirEntry objects for all regular files under directory, in sorted order.
+
+    Files in a directory come before its subdirectories. Uses os.scandir so
+    file/dir checks come from the directory listing instead of extra stat calls.
+    """
+    with os.scandir(directory) as it:
+        entries = sorted(it, key=lambda e: e.name)
+
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file():
+            yield entry
+
+    for subdir in subdirs:
+        yield from iter_files(subdir)
+
+
+def load_hash_cache() -> dict:
+    """Load cached per-file digests, keyed by path relative to the skills directory."""
+    try:
+        with open(os.path.abspath(CACHE_FILE), "r") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_hash_cache(cache: dict, skills_dir: str) -> None:
+    """Write the digest cache, dropping entries for files that no longer exist."""
+    cache = {
+        key: entry
+        for key, entry in sorted(cache.items())
+        if os.path.isfile(os.path.join(skills_dir, key))
+    }
+    try:
+        with open(os.path.abspath(CACHE_FILE), "w") as f:
+            json.dump(cache, f, indent=2)
+            f.write("\n")
+    except OSError as e:
+        print(f"  WARNING: Could not write hash cache: {e}", file=sys.stderr)
+
+
+def cached_digest(entry, st: os.stat_result) -> bytes | None:
+    """Return the cached digest if entry is well-formed and matches st, else None."""
+    if not isinstance(entry, dict):
+        return None
+    if entry.get("mtime_ns") != st.st_mtime_ns or entry.get("size") != st.st_size:
+        return None
+    try:
+        digest = bytes.fromhex(entry["digest"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return digest if len(digest) == hashlib.sha256().digest_size else None
+
+
+def compute_content_hash(skill_dir: str, cache: dict | None = None) -> str:
+    """Compute SHA-256 over the per-file digests of all files in a skill directory.
 
-    for root, _dirs, files in sorted(os.walk(skill_dir)):
-        for filename in sorted(files):
-            filepath = os.path.join(root, filename)
-            rel_path = os.path.relpath(filepath, skill_dir)
-            hasher.update(rel_path.encode("utf-8"))
-            with open(filepath, "rb") as f:
-                hasher.update(f.read())
+    The exact algorithm and file order are documented in registry/README.md
+    ("Content Hash"); keep the two in sync.
+
+    Files whose mtime and size match an entry in ``cache`` reuse the cached
+    digest; everything else is rehashed and written back to ``cache``.
+    """
+    if cache is None:
+        cache = {}
+
+    filepaths = []
+    digests = {}
+    stale = []
+    for file_entry in iter_files(skill_dir):
+        filepath = file_entry.path
+        filepaths.append(filepath)
+        key = os.path.relpath(filepath, os.path.dirname(skill_dir))
+        st = file_entry.stat()
+        digest = cached_digest(cache.get(key), st)
+        if digest is not None:
+            digests[filepath] = digest
+        else:
+            stale.append((key, filepath, st))
+
+    stale_paths = [filepath for _key, filepath, _st in stale]
+    stale_sizes = [st.st_size for _key, _filepath, st in stale]
+    if (
+        len(stale) > 1
+        and (os.cpu_count() or 1) > 1
+        and sum(stale_sizes) >= PARALLEL_HASH_MIN_BYTES
+    ):
+        # hashlib releases the GIL while hashing, so large files hash in parallel.
+        # Imported here since most runs never need it.
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            fresh = list(pool.map(hash_file, stale_paths, stale_sizes))
+    else:
+        fresh = [hash_file(path, size) for path, size in zip(stale_paths, stale_sizes)]
+
+    for (key, filepath, st), digest in zip(stale, fresh):
+        digests[filepath] = digest
+        cache[key] = {
+            "mtime_ns": st.st_mtime_ns,
+            "size": st.st_size,
+            "digest": digest.hex(),
+        }
+
+    hasher = hashlib.sha256()
+    for filepath in filepaths:
+        rel_path = os.path.relpath(filepath, skill_dir)
+        hasher.update(rel_path.encode("utf-8"))
+        hasher.update(digests[filepath])
 
     return f"sha256:{hasher.hexdigest()}"
 
@@ -39,20 +165,31 @@ def parse_skill_md(skill_dir: str):
         print(f"  WARNING: No SKILL.md found in {skill_dir}", file=sys.stderr)
         return None
 
-    with open(skill_md, "r") as f:
-        content = f.read()
+    # Only read as far as the closing delimiter; the markdown body is not needed.
+    with open(skill_md, "rb") as f:
+        head = f.read(FRONTMATTER_READ_SIZE)
+        if not head.startswith(b"---"):
+            print(
+                f"  ERROR: SKILL.md missing frontmatter in {skill_dir}",
+                file=sys.stderr,
+            )
+            return None
 
-    if not content.startswith("---"):
-        print(f"  ERROR: SKILL.md missing frontmatter in {skill_dir}", file=sys.stderr)
-        return None
+        end = head.find(b"---", 3)
+        while end < 0:
+            more = f.read(FRONTMATTER_READ_SIZE)
+            if not more:
+                break
+            searched = max(3, len(head) - 2)
+            head += more
+            end = head.find(b"---", searched)
 
-    parts = content.split("---", 2)
-    if len(parts) < 3:
+    if end < 0:
         print(f"  ERROR: Invalid frontmatter format in {skill_dir}", file=sys.stderr)
         return None
 
     try:
-        frontmatter = yaml.safe_load(parts[1])
+        frontmatter = yaml.load(head[3:end], Loader=YamlLoader)
     except yaml.YAMLError as e:
         print(f"  ERROR: YAML parse error in {skill_dir}: {e}", file=sys.stderr)
         return None
@@ -72,9 +209,33 @@ def parse_skill_md(skill_dir: str):
     return frontmatter
 
 
+def process_skill(skill_dir: str, cache: dict):
+    """Validate a skill directory and build its registry entry (None if invalid)."""
+    print(f"Processing: {os.path.basename(skill_dir)}")
+    frontmatter = parse_skill_md(skill_dir)
+    if frontmatter is None:
+        return None
+
+    content_hash = compute_content_hash(skill_dir, cache)
+    requires_env = frontmatter.get("requires_env", [])
+    has_execution = "execution" in frontmatter
+
+    entry = {
+        "id": frontmatter["name"],
+        "description": frontmatter["description"].strip(),
+        "version": frontmatter["version"],
+        "author": frontmatter["author"],
+        "contentHash": content_hash,
+        "requiresEnv": requires_env if requires_env else [],
+        "hasExecutionManifest": has_execution,
+    }
+    return entry
+
+
 def main():
     skills = []
     errors = 0
+    hash_cache = load_hash_cache()
 
     skills_dir = os.path.abspath(SKILLS_DIR)
     if not os.path.isdir(skills_dir):
@@ -86,27 +247,13 @@ def main():
         if not os.path.isdir(skill_dir):
             continue
 
-        print(f"Processing: {entry}")
-        frontmatter = parse_skill_md(skill_dir)
-        if frontmatter is None:
+        skill = process_skill(skill_dir, hash_cache)
+        if skill is None:
             errors += 1
-            continue
+        else:
+            skills.append(skill)
 
-        content_hash = compute_content_hash(skill_dir)
-        requires_env = frontmatter.get("requires_env", [])
-        has_execution = "execution" in frontmatter
-
-        skills.append(
-            {
-                "id": frontmatter["name"],
-                "description": frontmatter["description"].strip(),
-                "version": frontmatter["version"],
-                "author": frontmatter["author"],
-                "contentHash": content_hash,
-                "requiresEnv": requires_env if requires_env else [],
-                "hasExecutionManifest": has_execution,
-            }
-        )
+    save_hash_cache(hash_cache, skills_dir)
 
     if errors > 0:
         print(f"\n{errors} skill(s) failed validation", file=sys.stderr)
@@ -114,10 +261,21 @@ def main():
 
     registry = {"skills": skills}
     output_path = os.path.abspath(OUTPUT_FILE)
+    output = json.dumps(registry, indent=2) + "\n"
+
+    # Leave an identical registry.json untouched so its mtime doesn't change.
+    try:
+        with open(output_path, "r") as f:
+            unchanged = f.read() == output
+    except OSError:
+        unchanged = False
+
+    if unchanged:
+        print(f"\n{output_path} is up to date with {len(skills)} skill(s)")
+        return
 
     with open(output_path, "w") as f:
-        json.dump(registry, f, indent=2)
-        f.write("\n")
+        f.write(output)
 
     print(f"\nGenerated {output_path} with {len(skills)} skill(s)")
 
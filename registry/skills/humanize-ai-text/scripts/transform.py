@@ -8,35 +8,73 @@ import sys
 import re
 
 
+# Lowercased phrase -> replacement. Phrases in _TRAILING_COMMA also consume a
+# comma directly after them, so "Furthermore, the" becomes "Also, the".
+_REPLACEMENTS = {
+    "it is important to note that": "",
+    "in order to": "To",
+    "utilize": "Use",
+    "it is worth mentioning that": "",
+    "in conclusion": "",
+    "furthermore": "Also,",
+    "additionally": "Also,",
+    "nevertheless": "Still,",
+    "consequently": "So,",
+}
+
+_TRAILING_COMMA = {
+    "in conclusion",
+    "furthermore",
+    "additionally",
+    "nevertheless",
+    "consequently",
+}
+
+_PHRASES = list(_REPLACEMENTS)
+
+# Single pass over the input instead of one re.sub per phrase. Each phrase has
+# its own capture group, so the replacement is picked by group index: with
+# re.IGNORECASE the matched text need not lowercase back to the dict key
+# (e.g. "İ" matches "i", "ſ" matches "s"). The leading lookahead on the
+# phrases' first letters lets re skip most positions with a cheap
+# character-class test before trying \b and the full alternation.
+_PATTERN = re.compile(
+    r"(?=[{}])\b(?:{})".format(
+        re.escape("".join(sorted({p[0] for p in _PHRASES}))),
+        "|".join(
+            f"({re.escape(p)})\\b,?" if p in _TRAILING_COMMA else f"({re.escape(p)})\\b"
+            for p in _PHRASES
+        ),
+    ),
+    re.IGNORECASE,
+)
+
+
 def humanize(text: str) -> str:
-    replacements = [
-        (r"\bIt is important to note that\b", ""),
-        (r"\bIn order to\b", "To"),
-        (r"\bUtilize\b", "Use"),
-        (r"\butilize\b", "use"),
-        (r"\bIt is worth mentioning that\b", ""),
-        (r"\bIn conclusion,?\b", ""),
-        (r"\bFurthermore,?\b", "Also,"),
-        (r"\bAdditionally,?\b", "Also,"),
-        (r"\bNevertheless,?\b", "Still,"),
-        (r"\bConsequently,?\b", "So,"),
-    ]
-
-    result = text
-    for pattern, replacement in replacements:
-        result = re.sub(pattern, replacement, result, flags=re.IGNORECASE)
-
-    result = re.sub(r"\s{2,}", " ", result).strip()
-    return result
+    """Rewrite common AI-sounding phrases and collapse whitespace.
+
+    >>> humanize("In order to go, we utilize tools.")
+    'To go, we Use tools.'
+    >>> humanize("İn order to go")
+    'To go'
+    >>> humanize("Conſequently, yes")
+    'So, yes'
+    >>> humanize("Furthermore, the cat sat. In conclusion, done.")
+    'Also, the cat sat. done.'
+    """
+    result = _PATTERN.sub(lambda m: _REPLACEMENTS[_PHRASES[m.lastindex - 1]], text)
+    return " ".join(result.split())
 
 
 def main():
     if len(sys.argv) > 1:
-        input_text = " ".join(sys.argv[1:])
-    else:
-        input_text = sys.stdin.read()
+        print(humanize(" ".join(sys.argv[1:])))
+        return
 
-    print(humanize(input_text))
+    # Rewrites never span lines, so stdin is processed and flushed as it
+    # arrives. Empty stdin produces no output.
+    for line in sys.stdin:
+        print(humanize(line), flush=True)
 
 
 if __name__ == "__main__":
@@ -5,42 +5,51 @@ Scores sentences by word frequency and returns the top ones.
 No external dependencies required.
 """
 
+import heapq
 import sys
 import re
 from collections import Counter
 
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_WORD = re.compile(r'\b[a-z]+\b')
+
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
+    'should', 'may', 'might', 'can', 'shall', 'to', 'of', 'in', 'for',
+    'on', 'with', 'at', 'by', 'from', 'as', 'into', 'through', 'during',
+    'before', 'after', 'above', 'below', 'between', 'and', 'but', 'or',
+    'not', 'no', 'nor', 'so', 'yet', 'both', 'either', 'neither', 'each',
+    'every', 'all', 'any', 'few', 'more', 'most', 'other', 'some', 'such',
+    'than', 'too', 'very', 'just', 'because', 'if', 'when', 'while',
+    'where', 'how', 'what', 'which', 'who', 'whom', 'this', 'that',
+    'these', 'those', 'it', 'its', 'i', 'me', 'my', 'we', 'our', 'you',
+    'your', 'he', 'him', 'his', 'she', 'her', 'they', 'them', 'their',
+})
+
 
 def summarize(text: str, num_sentences: int = 3) -> str:
-    sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+    sentences = _SENTENCE_SPLIT.split(text.strip())
 
     if len(sentences) <= num_sentences:
         return text.strip()
 
-    words = re.findall(r'\b[a-z]+\b', text.lower())
-    stop_words = {
-        'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could',
-        'should', 'may', 'might', 'can', 'shall', 'to', 'of', 'in', 'for',
-        'on', 'with', 'at', 'by', 'from', 'as', 'into', 'through', 'during',
-        'before', 'after', 'above', 'below', 'between', 'and', 'but', 'or',
-        'not', 'no', 'nor', 'so', 'yet', 'both', 'either', 'neither', 'each',
-        'every', 'all', 'any', 'few', 'more', 'most', 'other', 'some', 'such',
-        'than', 'too', 'very', 'just', 'because', 'if', 'when', 'while',
-        'where', 'how', 'what', 'which', 'who', 'whom', 'this', 'that',
-        'these', 'those', 'it', 'its', 'i', 'me', 'my', 'we', 'our', 'you',
-        'your', 'he', 'him', 'his', 'she', 'her', 'they', 'them', 'their',
-    }
-
-    word_freq = Counter(w for w in words if w not in stop_words)
+    # Tokenize each sentence once; the tokens feed both the frequency table and
+    # the per-sentence scores.
+    sentence_tokens = [_WORD.findall(s.lower()) for s in sentences]
+
+    word_freq = Counter(
+        w for tokens in sentence_tokens for w in tokens if w not in _STOP_WORDS
+    )
 
     scored = []
     for i, sentence in enumerate(sentences):
-        sentence_words = re.findall(r'\b[a-z]+\b', sentence.lower())
-        score = sum(word_freq.get(w, 0) for w in sentence_words)
+        # Counter returns 0 for missing words, so map() can look up in C.
+        score = sum(map(word_freq.__getitem__, sentence_tokens[i]))
         scored.append((score, i, sentence))
 
-    scored.sort(key=lambda x: x[0], reverse=True)
-    top = sorted(scored[:num_sentences], key=lambda x: x[1])
+    top = heapq.nlargest(num_sentences, scored, key=lambda x: x[0])
+    top.sort(key=lambda x: x[1])
 
     return " ".join(s[2] for s in top)
 
@@ -2,72 +2,257 @@
 """
 Translate text using the OpenAI API.
 Requires OPENAI_API_KEY environment variable.
+
+Translations are cached on disk by a hash of the model, prompt and input
+text, so repeated inputs don't hit the API again.
+
+With --lines, each line of stdin is translated as its own request (so each
+line must carry its own instruction), several at a time, and the results are
+streamed out one per line in input order. Line breaks inside a translation are
+replaced with spaces so output stays one line per input line.
 """
 
 import os
 import sys
 import json
-from urllib.request import Request, urlopen
-from urllib.error import HTTPError, URLError
+import base64
+import hashlib
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException, HTTPSConnection, RemoteDisconnected
+from itertools import chain
+from urllib.parse import unquote, urlsplit
+from urllib.request import getproxies, proxy_bypass
 
+API_HOST = "api.openai.com"
+API_PATH = "/v1/chat/completions"
+MODEL = "gpt-4o-mini"
+SYSTEM_PROMPT = "You are a translator. Translate the user's text as requested. Return only the translated text, nothing else."
 
-def translate(text: str) -> str:
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "eigenskills",
+    "translate",
+)
+
+# Concurrent requests in --lines mode
+MAX_CONCURRENT_REQUESTS = 16
+
+# One connection per thread, reused across calls so repeated translations skip
+# the TCP + TLS handshake.
+_local = threading.local()
+
+
+def _new_connection() -> HTTPSConnection:
+    """Open a connection to the API, tunnelling through HTTPS_PROXY if it is set."""
+    proxy = getproxies().get("https")
+    if not proxy or proxy_bypass(API_HOST):
+        return HTTPSConnection(API_HOST, timeout=30)
+
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urlsplit(proxy)
+    tunnel_headers = {}
+    if parts.username is not None:
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+        tunnel_headers["Proxy-Authorization"] = f"Basic {token}"
+
+    connection = HTTPSConnection(parts.hostname, parts.port or 80, timeout=30)
+    connection.set_tunnel(API_HOST, 443, headers=tunnel_headers)
+    return connection
+
+
+def _post(body: bytes, headers: dict):
+    """POST to the chat completions endpoint, returning (status, response body)."""
+    while True:
+        connection = getattr(_local, "connection", None)
+        reused = connection is not None
+        if not reused:
+            connection = _local.connection = _new_connection()
+        try:
+            connection.request("POST", API_PATH, body=body, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        except (RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            # The server may have closed an idle keep-alive connection; retry
+            # once on a fresh one.
+            connection.close()
+            _local.connection = None
+            if not reused:
+                raise
+
+
+def _cache_path(text: str) -> str:
+    key = hashlib.sha256(f"{MODEL}\x00{SYSTEM_PROMPT}\x00{text}".encode("utf-8"))
+    return os.path.join(CACHE_DIR, key.hexdigest())
+
+
+def _read_cache(text: str):
+    try:
+        with open(_cache_path(text), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_cache(text: str, translation: str) -> None:
+    # Best-effort: write to a temp file and rename so readers never see a
+    # partial entry, and ignore failures such as a read-only HOME.
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+    except OSError:
+        return
+
+    replaced = False
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(translation)
+        os.replace(tmp_path, _cache_path(text))
+        replaced = True
+    except OSError:
+        pass
+    finally:
+        if not replaced:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+class TranslationError(Exception):
+    """A translation failed; the message is the (multi-line) report for stderr."""
+
+
+def get_api_key() -> str:
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
-        print("Error: OPENAI_API_KEY environment variable is not set.", file=sys.stderr)
-        print("Please add OPENAI_API_KEY to your agent's environment variables.", file=sys.stderr)
-        sys.exit(1)
+        raise TranslationError(
+            "Error: OPENAI_API_KEY environment variable is not set.\n"
+            "Please add OPENAI_API_KEY to your agent's environment variables."
+        )
+    return api_key
+
+
+def translate(text: str) -> str:
+    api_key = get_api_key()
 
     # Mask key for debug output (show first 8 chars only)
     masked_key = api_key[:8] + "..." if len(api_key) > 8 else "***"
-    
+
+    cached = _read_cache(text)
+    if cached is not None:
+        return cached
+
     request_body = json.dumps({
-        "model": "gpt-4o-mini",
+        "model": MODEL,
         "messages": [
             {
                 "role": "system",
-                "content": "You are a translator. Translate the user's text as requested. Return only the translated text, nothing else."
+                "content": SYSTEM_PROMPT
             },
             {"role": "user", "content": text}
         ],
         "max_tokens": 2000
     }).encode("utf-8")
 
-    req = Request(
-        "https://api.openai.com/v1/chat/completions",
-        data=request_body,
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
-    )
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
 
     try:
-        with urlopen(req, timeout=30) as response:
-            result = json.loads(response.read())
-            return result["choices"][0]["message"]["content"]
-    except HTTPError as e:
-        error_body = e.read().decode("utf-8", errors="replace")
-        print(f"Error: OpenAI API returned HTTP {e.code}", file=sys.stderr)
-        print(f"API Key used: {masked_key}", file=sys.stderr)
+        status, response_body = _post(request_body, headers)
+    except (OSError, HTTPException) as e:
+        raise TranslationError(
+            f"Error: Failed to connect to OpenAI API\nReason: {e}"
+        ) from e
+    except Exception as e:
+        raise TranslationError(
+            f"Error: Unexpected error during API call\n"
+            f"Details: {type(e).__name__}: {e}"
+        ) from e
+
+    if status != 200:
+        error_body = response_body.decode("utf-8", errors="replace")
+        report = f"Error: OpenAI API returned HTTP {status}\nAPI Key used: {masked_key}"
         try:
             error_json = json.loads(error_body)
             error_msg = error_json.get("error", {}).get("message", error_body)
-            print(f"Details: {error_msg}", file=sys.stderr)
+            report += f"\nDetails: {error_msg}"
         except json.JSONDecodeError:
-            print(f"Response: {error_body[:500]}", file=sys.stderr)
-        sys.exit(1)
-    except URLError as e:
-        print(f"Error: Failed to connect to OpenAI API", file=sys.stderr)
-        print(f"Reason: {e.reason}", file=sys.stderr)
-        sys.exit(1)
+            report += f"\nResponse: {error_body[:500]}"
+        raise TranslationError(report)
+
+    try:
+        result = json.loads(response_body)
+        translation = result["choices"][0]["message"]["content"]
     except Exception as e:
-        print(f"Error: Unexpected error during API call", file=sys.stderr)
-        print(f"Details: {type(e).__name__}: {e}", file=sys.stderr)
-        sys.exit(1)
+        raise TranslationError(
+            f"Error: Unexpected error during API call\n"
+            f"Details: {type(e).__name__}: {e}"
+        ) from e
+
+    # A refusal can come back with "content": null; only cache real text.
+    if isinstance(translation, str):
+        _write_cache(text, translation)
+    return translation
+
+
+def _translate_line(line: str) -> str:
+    if not line.strip():
+        return ""
+    # Keep the output to exactly one line per input line.
+    return " ".join(str(translate(line)).splitlines())
+
+
+def translate_lines(lines):
+    """Translate each line independently, running requests concurrently.
+
+    Lines are read lazily and results are yielded in input order, with at most
+    MAX_CONCURRENT_REQUESTS in flight. Blank lines are passed through unchanged
+    so output lines up with input. The first failure raises TranslationError
+    and cancels any requests that have not started yet.
+    """
+    get_api_key()
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        try:
+            for line in lines:
+                pending.append(pool.submit(_translate_line, line))
+                if len(pending) >= MAX_CONCURRENT_REQUESTS:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
 
 
 def main():
+    if sys.argv[1:] == ["--lines"]:
+        lines = (line.rstrip("\r\n") for line in sys.stdin)
+        # Read up to the first non-blank line so empty input fails up front.
+        head = []
+        for line in lines:
+            head.append(line)
+            if line.strip():
+                break
+        else:
+            print("Error: No input text provided", file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            for translated in translate_lines(chain(head, lines)):
+                print(translated, flush=True)
+        except TranslationError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        return
+
     if len(sys.argv) > 1:
         input_text = " ".join(sys.argv[1:])
     else:
@@ -77,7 +262,13 @@ def main():
         print("Error: No input text provided", file=sys.stderr)
         sys.exit(1)
 
-    print(translate(input_text))
+    try:
+        translation = translate(input_text)
+    except TranslationError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    print(translation)
 
 
 if __name__ == "__main__":